@@ -1,33 +1,125 @@
 from fastapi import FastAPI, HTTPException, Query, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field, validator
 import json
+import orjson
 from typing import Dict, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 import hashlib
 from collections import Counter
 import re
 
-# Custom JSON Response with pretty printing
-class PrettyJSONResponse(JSONResponse):
-    def render(self, content) -> bytes:
+def render_pretty_json(content) -> bytes:
+    """
+    Render content as indented JSON.
+    
+    Falls back to the stdlib encoder for values orjson rejects, such as
+    integers beyond 64 bits coming from unbounded query parameters.
+    """
+    try:
+        return orjson.dumps(content, option=orjson.OPT_INDENT_2)
+    except orjson.JSONEncodeError:
         return json.dumps(
             content,
             ensure_ascii=False,
             allow_nan=False,
             indent=2,
-            separators=(", ", ": "),
+            separators=(",", ": "),
         ).encode("utf-8")
 
+# Custom JSON Response with pretty printing
+class PrettyJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return render_pretty_json(content)
+
+# Lists longer than this are streamed instead of rendered in one response
+STREAM_MIN_ITEMS = 2048
+
+# Number of list items serialized per chunk when streaming
+STREAM_BATCH_SIZE = 256
+
+def stream_data_response(data: List[dict], extra: dict) -> Response:
+    """
+    Return {"data": [...], **extra} in the same layout as PrettyJSONResponse.
+    
+    Lists up to STREAM_MIN_ITEMS long are rendered in a single
+    PrettyJSONResponse, which is faster. Longer lists are streamed a batch at
+    a time, so their encoded body is never held in memory at once. The extra keys are rendered up front so an
+    encoding error surfaces before any headers are sent. The generator is
+    async so Starlette does not hop to the threadpool for every chunk.
+    """
+    if len(data) <= STREAM_MIN_ITEMS:
+        return PrettyJSONResponse({"data": data, **extra})
+    
+    # Drop the opening brace of the rendered extra keys
+    tail = render_pretty_json(extra)[1:]
+    
+    async def generate():
+        yield b'{\n  "data": ['
+        for start in range(0, len(data), STREAM_BATCH_SIZE):
+            yield b"".join(
+                (b",\n    " if start + offset else b"\n    ")
+                + orjson.dumps(item, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n    ")
+                for offset, item in enumerate(data[start:start + STREAM_BATCH_SIZE])
+            )
+        yield b"\n  ]," if data else b"],"
+        yield tail
+    
+    return StreamingResponse(generate(), media_type="application/json")
+
 app = FastAPI(title="String Analyzer API",
               version="1.0.0",
               description="String Analyzer API for analyzing strings and storing their computed properties",
               default_response_class=PrettyJSONResponse  # Pretty JSON by default
              )
 
+# Literal keywords recognised in natural language queries, matched in one pass.
+# None of them can overlap another, so a single scan finds the same set as
+# testing each keyword separately.
+_NL_KEYWORD_RE = re.compile(r"palindrom|single word|one word|two word|three word|first vowel")
+
+# Precompiled pattern for natural language query parsing. Every length and
+# containment clause is a named alternative so the query is scanned only once.
+# The containment letter sits in a lookahead so it is not consumed and a
+# following clause ("contain exactly 5 characters") can still match.
+_NL_CLAUSE_RE = re.compile(
+    r"longer than (?P<longer>\d+)"
+    r"|shorter than (?P<shorter>\d+)"
+    r"|at least (?P<at_least>\d+) characters?"
+    r"|at most (?P<at_most>\d+) characters?"
+    r"|exactly (?P<exactly>\d+) characters?"
+    r"|contain(?:s|ing)? (?:the )?(?:letter |character )?(?=['\"]?(?P<contains>[a-z]))"
+)
+
+# Filter assignments for each matched keyword or clause, applied in order so
+# later rules take precedence ("single word" over "two word", "first vowel"
+# over an explicit letter). Each converter receives the clause's captured text.
+_NL_RULES = (
+    ("palindrom", "is_palindrome", lambda _: True),
+    ("three word", "word_count", lambda _: 3),
+    ("two word", "word_count", lambda _: 2),
+    ("one word", "word_count", lambda _: 1),
+    ("single word", "word_count", lambda _: 1),
+    ("longer", "min_length", lambda n: int(n) + 1),
+    ("shorter", "max_length", lambda n: int(n) - 1),
+    ("at_least", "min_length", int),
+    ("at_most", "max_length", int),
+    ("exactly", "min_length", int),
+    ("exactly", "max_length", int),
+    ("contains", "contains_character", str),
+    ("first vowel", "contains_character", lambda _: "a"),
+)
+
 # In-memory storage (using SHA256 hash as key)
 string_store: Dict[str, dict] = {}
 
+# Secondary indexes over string_store, mapping a property value to the ids
+# that have it. Inner dicts act as insertion-ordered sets so filtered results
+# keep the same order as string_store.
+palindrome_index: Dict[bool, Dict[str, None]] = {}
+word_count_index: Dict[int, Dict[str, None]] = {}
+character_index: Dict[str, Dict[str, None]] = {}
+
 # Pydantic models for request/response validation
 class StringInput(BaseModel):
     value: str = Field(..., description="String to analyze")
@@ -56,25 +148,36 @@ class NaturalLanguageResponse(BaseModel):
     count: int
     interpreted_query: Dict
 
+# Helper function to compute the SHA-256 identifier of a string
+def compute_sha256(value: str) -> str:
+    """Return the hex SHA-256 digest used as a string's id."""
+    # The digest is an identifier, not a security control
+    return hashlib.sha256(value.encode(), usedforsecurity=False).hexdigest()
+
 # Helper function to compute string properties
-def analyze_string(value: str) -> StringProperties:
-    """Compute all properties for a given string."""
-    # Compute SHA-256 hash
-    sha256_hash = hashlib.sha256(value.encode()).hexdigest()
-    
+def analyze_string(value: str, sha256_hash: str) -> StringProperties:
+    """Compute all properties for a given string whose hash is already known."""
     # Check if palindrome (case-insensitive)
-    normalized = value.lower()
-    is_palindrome = normalized == normalized[::-1]
+    # ASCII lowercases one character to one, so mismatched ends can be rejected
+    # before lowering the whole string. Otherwise compare the first half against
+    # the reversed second half, bailing out on mismatched ends before slicing.
+    if value.isascii() and value[:1].lower() != value[-1:].lower():
+        is_palindrome = False
+    else:
+        normalized = value.lower()
+        half = len(normalized) // 2
+        is_palindrome = (
+            normalized[:1] == normalized[-1:]
+            and normalized[:half] == normalized[:-half - 1:-1]
+        )
     
-    # Count unique characters
-    unique_characters = len(set(value))
+    # Character frequency map (its size is the unique character count)
+    character_frequency_map = dict(Counter(value))
+    unique_characters = len(character_frequency_map)
     
     # Count words (split by whitespace)
     word_count = len(value.split())
     
-    # Character frequency map
-    character_frequency_map = dict(Counter(value))
-    
     return StringProperties(
         length=len(value),
         is_palindrome=is_palindrome,
@@ -84,32 +187,60 @@ def analyze_string(value: str) -> StringProperties:
         character_frequency_map=character_frequency_map
     )
 
-def apply_filters(strings: List[dict], filters: dict) -> List[dict]:
-    """Apply filtering logic to a list of strings."""
-    filtered = strings
-    
-    # Filter by is_palindrome
+def index_string(string_data: dict) -> None:
+    """Add a stored string to the secondary indexes."""
+    string_id = string_data["id"]
+    properties = string_data["properties"]
+    palindrome_index.setdefault(properties["is_palindrome"], {})[string_id] = None
+    word_count_index.setdefault(properties["word_count"], {})[string_id] = None
+    for char in properties["character_frequency_map"]:
+        character_index.setdefault(char, {})[string_id] = None
+
+def unindex_string(string_data: dict) -> None:
+    """Remove a stored string from the secondary indexes."""
+    string_id = string_data["id"]
+    properties = string_data["properties"]
+    entries = [
+        (palindrome_index, properties["is_palindrome"]),
+        (word_count_index, properties["word_count"]),
+    ]
+    entries.extend((character_index, char) for char in properties["character_frequency_map"])
+    for index, key in entries:
+        ids = index[key]
+        del ids[string_id]
+        if not ids:
+            del index[key]
+
+def apply_filters(filters: dict) -> List[dict]:
+    """Apply filtering logic to the stored strings."""
+    # Narrow down candidates using the secondary indexes
+    candidates = []
     if filters.get("is_palindrome") is not None:
-        filtered = [s for s in filtered if s["properties"]["is_palindrome"] == filters["is_palindrome"]]
-    
-    # Filter by min_length
-    if filters.get("min_length") is not None:
-        filtered = [s for s in filtered if s["properties"]["length"] >= filters["min_length"]]
-    
-    # Filter by max_length
-    if filters.get("max_length") is not None:
-        filtered = [s for s in filtered if s["properties"]["length"] <= filters["max_length"]]
-    
-    # Filter by word_count
+        candidates.append(palindrome_index.get(filters["is_palindrome"], {}))
     if filters.get("word_count") is not None:
-        filtered = [s for s in filtered if s["properties"]["word_count"] == filters["word_count"]]
-    
-    # Filter by contains_character
+        candidates.append(word_count_index.get(filters["word_count"], {}))
     if filters.get("contains_character"):
-        char = filters["contains_character"]
-        filtered = [s for s in filtered if char in s["value"]]
+        candidates.append(character_index.get(filters["contains_character"], {}))
     
-    return filtered
+    if candidates:
+        smallest = min(candidates, key=len)
+        strings = (
+            string_store[string_id] for string_id in smallest
+            if all(string_id in ids for ids in candidates)
+        )
+    else:
+        strings = string_store.values()
+    
+    # Filter by min_length / max_length in the same pass that builds the result
+    min_length = filters.get("min_length")
+    max_length = filters.get("max_length")
+    if min_length is None and max_length is None:
+        return list(strings)
+    if min_length is None:
+        min_length = 0
+    if max_length is None:
+        max_length = float("inf")
+    return [s for s in strings if min_length <= s["properties"]["length"] <= max_length]
 
 def parse_natural_language_query(query: str) -> dict:
     """
@@ -126,49 +257,14 @@ def parse_natural_language_query(query: str) -> dict:
     query_lower = query.lower()
     filters = {}
     
-    # Palindrome detection
-    if "palindrom" in query_lower:
-        filters["is_palindrome"] = True
-    
-    # Word count detection
-    if "single word" in query_lower or "one word" in query_lower:
-        filters["word_count"] = 1
-    elif "two word" in query_lower:
-        filters["word_count"] = 2
-    elif "three word" in query_lower:
-        filters["word_count"] = 3
-    
-    # Length filters
-    longer_match = re.search(r"longer than (\d+)", query_lower)
-    if longer_match:
-        filters["min_length"] = int(longer_match.group(1)) + 1
-    
-    shorter_match = re.search(r"shorter than (\d+)", query_lower)
-    if shorter_match:
-        filters["max_length"] = int(shorter_match.group(1)) - 1
-    
-    at_least_match = re.search(r"at least (\d+) characters?", query_lower)
-    if at_least_match:
-        filters["min_length"] = int(at_least_match.group(1))
-    
-    at_most_match = re.search(r"at most (\d+) characters?", query_lower)
-    if at_most_match:
-        filters["max_length"] = int(at_most_match.group(1))
-    
-    exactly_match = re.search(r"exactly (\d+) characters?", query_lower)
-    if exactly_match:
-        length = int(exactly_match.group(1))
-        filters["min_length"] = length
-        filters["max_length"] = length
-    
-    # Character containment
-    contains_match = re.search(r"contain(?:s|ing)? (?:the )?(?:letter |character )?['\"]?([a-z])['\"]?", query_lower)
-    if contains_match:
-        filters["contains_character"] = contains_match.group(1)
-    
-    # Special case for "first vowel"
-    if "first vowel" in query_lower:
-        filters["contains_character"] = "a"
+    # Collect matched keywords and clauses (first occurrence of each clause wins)
+    matched = dict.fromkeys(_NL_KEYWORD_RE.findall(query_lower))
+    for match in _NL_CLAUSE_RE.finditer(query_lower):
+        matched.setdefault(match.lastgroup, match.group(match.lastgroup))
+    
+    for trigger, key, convert in _NL_RULES:
+        if trigger in matched:
+            filters[key] = convert(matched[trigger])
     
     # Validate for conflicting filters
     if "min_length" in filters and "max_length" in filters:
@@ -180,6 +276,10 @@ def parse_natural_language_query(query: str) -> dict:
     
     return filters
 
+# Endpoints are deliberately `async def`: they never block on I/O, and keeping
+# them on the event loop means reads and writes of string_store and its indexes
+# never interleave. Plain `def` handlers would run in Starlette's threadpool,
+# where a list request could observe an insert or delete half-applied.
 @app.post("/strings", response_model=StringResponse, status_code=status.HTTP_201_CREATED)
 async def create_string(string_input: StringInput):
     """
@@ -189,20 +289,20 @@ async def create_string(string_input: StringInput):
     Raises 409 Conflict if the string already exists.
     """
     value = string_input.value
+    string_id = compute_sha256(value)
     
-    # Compute properties
-    properties = analyze_string(value)
-    string_id = properties.sha256_hash
-    
-    # Check if string already exists
+    # Check if string already exists before doing the full analysis
     if string_id in string_store:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="String already exists in the system"
         )
     
+    # Compute properties
+    properties = analyze_string(value, string_id)
+    
     # Create timestamp
-    created_at = datetime.utcnow().isoformat() + "Z"
+    created_at = datetime.now(timezone.utc).isoformat(timespec="microseconds").replace("+00:00", "Z")
     
     # Store the string data
     string_data = {
@@ -212,8 +312,56 @@ async def create_string(string_input: StringInput):
         "created_at": created_at
     }
     string_store[string_id] = string_data
+    index_string(string_data)
+    
+    # string_data is built from validated models, so skip response validation
+    return PrettyJSONResponse(string_data, status_code=status.HTTP_201_CREATED)
+
+# Declared before GET /strings/{string_value} so this static path is matched
+# first instead of being captured as a string value. The two routes still
+# collide: a stored string whose value is literally "filter-by-natural-language"
+# cannot be fetched via GET /strings/{string_value} (this route answers with
+# 422 for the missing query). POST and DELETE for that value are unaffected.
+@app.get("/strings/filter-by-natural-language", response_model=NaturalLanguageResponse)
+async def filter_by_natural_language(
+    query: str = Query(..., description="Natural language query to filter strings")
+):
+    """
+    Filter strings using natural language queries.
+    
+    Example queries:
+    - "all single word palindromic strings"
+    - "strings longer than 10 characters"
+    - "palindromic strings that contain the first vowel"
+    - "strings containing the letter z"
+    """
+    try:
+        # Parse the natural language query
+        filters = parse_natural_language_query(query)
+    except ValueError as e:
+        if "conflicting" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unable to parse natural language query: {str(e)}"
+            )
+    
+    # Apply filters
+    filtered_strings = apply_filters(filters)
     
-    return StringResponse(**string_data)
+    # Stored entries are already validated, so stream them without re-building
+    # them as models
+    return stream_data_response(filtered_strings, {
+        "count": len(filtered_strings),
+        "interpreted_query": {
+            "original": query,
+            "parsed_filters": filters
+        }
+    })
 
 @app.get("/strings/{string_value}", response_model=StringResponse)
 async def get_string(string_value: str):
@@ -223,7 +371,7 @@ async def get_string(string_value: str):
     Returns 404 if the string has not been analyzed before.
     """
     # Compute the hash of the requested string to look it up
-    string_id = hashlib.sha256(string_value.encode()).hexdigest()
+    string_id = compute_sha256(string_value)
     
     # Check if string exists in storage
     if string_id not in string_store:
@@ -232,7 +380,7 @@ async def get_string(string_value: str):
             detail="String not found in the system"
         )
     
-    return StringResponse(**string_store[string_id])
+    return PrettyJSONResponse(string_store[string_id])
 
 @app.get("/strings", response_model=FilteredResponse)
 async def list_strings_with_filters(
@@ -273,56 +421,15 @@ async def list_strings_with_filters(
     if contains_character is not None:
         filters["contains_character"] = contains_character
     
-    # Get all strings and apply filters
-    all_strings = list(string_store.values())
-    filtered_strings = apply_filters(all_strings, filters)
-    
-    return FilteredResponse(
-        data=[StringResponse(**s) for s in filtered_strings],
-        count=len(filtered_strings),
-        filters_applied=filters
-    )
-
-@app.get("/strings/filter-by-natural-language", response_model=NaturalLanguageResponse)
-async def filter_by_natural_language(
-    query: str = Query(..., description="Natural language query to filter strings")
-):
-    """
-    Filter strings using natural language queries.
-    
-    Example queries:
-    - "all single word palindromic strings"
-    - "strings longer than 10 characters"
-    - "palindromic strings that contain the first vowel"
-    - "strings containing the letter z"
-    """
-    try:
-        # Parse the natural language query
-        filters = parse_natural_language_query(query)
-    except ValueError as e:
-        if "conflicting" in str(e).lower():
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=str(e)
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unable to parse natural language query: {str(e)}"
-            )
-    
-    # Apply filters
-    all_strings = list(string_store.values())
-    filtered_strings = apply_filters(all_strings, filters)
+    # Apply filters to the stored strings
+    filtered_strings = apply_filters(filters)
     
-    return NaturalLanguageResponse(
-        data=[StringResponse(**s) for s in filtered_strings],
-        count=len(filtered_strings),
-        interpreted_query={
-            "original": query,
-            "parsed_filters": filters
-        }
-    )
+    # Stored entries are already validated, so stream them without re-building
+    # them as models
+    return stream_data_response(filtered_strings, {
+        "count": len(filtered_strings),
+        "filters_applied": filters
+    })
 
 @app.delete("/strings/{string_value}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_string(string_value: str):
@@ -331,7 +438,7 @@ async def delete_string(string_value: str):
     
     Returns 404 if the string doesn't exist.
     """
-    string_id = hashlib.sha256(string_value.encode()).hexdigest()
+    string_id = compute_sha256(string_value)
     
     if string_id not in string_store:
         raise HTTPException(
@@ -339,7 +446,7 @@ async def delete_string(string_value: str):
             detail="String not found in the system"
         )
     
-    del string_store[string_id]
+    unindex_string(string_store.pop(string_id))
     return None
 
 # Root endpoint
@@ -0,0 +1,143 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+HUGE = 2 ** 70
+
+
+@pytest.fixture(autouse=True)
+def clear_store():
+    for store in (main.string_store, main.palindrome_index, main.word_count_index, main.character_index):
+        store.clear()
+    yield
+
+
+def test_stream_data_response_rejects_unencodable_extra_eagerly():
+    with pytest.raises(TypeError):
+        main.stream_data_response([], {"count": 0, "filters_applied": object()})
+
+
+def test_stream_data_response_renders_extra_beyond_64_bits():
+    response = client.get("/strings", params={"min_length": HUGE})
+    assert response.status_code == 200
+    assert response.content == (
+        b'{\n  "data": [],\n  "count": 0,\n  "filters_applied": {\n'
+        b'    "min_length": 1180591620717411303424\n  }\n}'
+    )
+
+    # orjson renders the items and json.dumps the tail; the layouts must agree
+    client.post("/strings", json={"value": "racecar"})
+    response = client.get("/strings", params={"max_length": HUGE})
+    assert response.status_code == 200
+    expected = json.dumps(response.json(), ensure_ascii=False, indent=2, separators=(",", ": "))
+    assert response.content == expected.encode("utf-8")
+
+
+@pytest.mark.parametrize("params", [{"min_length": HUGE}, {"word_count": HUGE}])
+def test_list_strings_with_oversized_filters(params):
+    client.post("/strings", json={"value": "racecar"})
+    response = client.get("/strings", params=params)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 0
+    assert body["filters_applied"] == params
+
+
+def test_natural_language_with_oversized_number():
+    client.post("/strings", json={"value": "racecar"})
+    query = "shorter than 99999999999999999999999"
+    response = client.get("/strings/filter-by-natural-language", params={"query": query})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 1
+    assert body["interpreted_query"]["parsed_filters"] == {"max_length": 99999999999999999999998}
+
+
+def test_list_body_matches_pretty_json():
+    for value in ["racecar", "hello world", "abba"]:
+        client.post("/strings", json={"value": value})
+    response = client.get("/strings")
+    expected = main.PrettyJSONResponse(json.loads(response.content)).body
+    assert response.content == expected
+
+
+def brute_force_filter(filters):
+    results = []
+    for s in main.string_store.values():
+        properties = s["properties"]
+        if filters.get("is_palindrome") is not None and properties["is_palindrome"] != filters["is_palindrome"]:
+            continue
+        if filters.get("word_count") is not None and properties["word_count"] != filters["word_count"]:
+            continue
+        if filters.get("contains_character") and filters["contains_character"] not in s["value"]:
+            continue
+        if filters.get("min_length") is not None and properties["length"] < filters["min_length"]:
+            continue
+        if filters.get("max_length") is not None and properties["length"] > filters["max_length"]:
+            continue
+        results.append(s)
+    return results
+
+
+def test_indexes_stay_in_sync_with_store():
+    values = ["racecar", "abba", "hello world", "a b a", "zebra zoo", "Noon", "xy"]
+    for value in values:
+        assert client.post("/strings", json={"value": value}).status_code == 201
+    for value in ["abba", "zebra zoo", "a b a"]:
+        assert client.delete(f"/strings/{value}").status_code == 204
+
+    # Deleted strings leave no ids behind, and emptied buckets are dropped
+    for index in (main.palindrome_index, main.word_count_index, main.character_index):
+        assert all(ids for ids in index.values())
+        assert all(string_id in main.string_store for ids in index.values() for string_id in ids)
+    assert "z" not in main.character_index
+    assert "b" not in main.character_index
+    assert 3 not in main.word_count_index
+    assert list(main.character_index["a"]) == [main.compute_sha256("racecar")]
+
+    filter_sets = [
+        {},
+        {"is_palindrome": True},
+        {"is_palindrome": False},
+        {"word_count": 1},
+        {"word_count": 3},
+        {"contains_character": "a"},
+        {"contains_character": "z"},
+        {"min_length": 4},
+        {"max_length": 4},
+        {"is_palindrome": True, "contains_character": "a"},
+        {"is_palindrome": True, "word_count": 1, "min_length": 5},
+        {"word_count": 1, "contains_character": "o", "max_length": 4},
+        {"is_palindrome": False, "min_length": 3, "max_length": 11},
+    ]
+    for filters in filter_sets:
+        expected = brute_force_filter(filters)
+        assert main.apply_filters(filters) == expected, filters
+        response = client.get("/strings", params=filters)
+        assert [s["value"] for s in response.json()["data"]] == [s["value"] for s in expected], filters
+
+    # Re-inserting a deleted string puts it back in the indexes
+    client.post("/strings", json={"value": "zebra zoo"})
+    assert main.apply_filters({"contains_character": "z"}) == brute_force_filter({"contains_character": "z"})
+    assert [s["value"] for s in main.apply_filters({"word_count": 2})] == ["hello world", "zebra zoo"]
+
+
+def test_long_list_is_streamed_across_batches():
+    values = [f"value {i}" for i in range(main.STREAM_MIN_ITEMS + main.STREAM_BATCH_SIZE + 1)]
+    for value in values:
+        client.post("/strings", json={"value": value})
+
+    response = client.get("/strings", params={"min_length": 0})
+    assert response.status_code == 200
+    assert "content-length" not in response.headers
+    expected = main.PrettyJSONResponse({
+        "data": list(main.string_store.values()),
+        "count": len(values),
+        "filters_applied": {"min_length": 0},
+    }).body
+    assert response.content == expected
+    assert [s["value"] for s in response.json()["data"]] == values